@@ -0,0 +1,227 @@
+"""
+Measure the Python-side cost of the sending loop without a browser.
+
+A fake WebDriver returns elements instantly and sleeps, prompts, console
+output, logging and result file writes are patched out, so what remains is
+the orchestration overhead per contact (pandas, formatting, result
+bookkeeping, building the result tables).
+
+Usage:
+    python bench_orchestration.py
+    python bench_orchestration.py --sizes 10000 100000 --modes batch
+    python bench_orchestration.py --min-contacts-per-sec 5000
+"""
+import argparse
+import builtins
+import contextlib
+import gc
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from unittest import mock
+
+import pandas as pd
+from selenium.common.exceptions import NoSuchElementException
+
+# Give the root logger a handler first so importing bulk does not create a log file
+logging.basicConfig(handlers=[logging.NullHandler()])
+
+import bulk
+
+COUNTRY_CODE = "91"
+MESSAGE = "Hello from the orchestration benchmark"
+# XPaths for error and pending states; the fake page never shows them
+ERROR_MARKERS = ("invalid", "Phone not connected", "Reconnecting", "msg-time")
+
+
+class FakeElement:
+    """Element stub that accepts every interaction."""
+
+    def send_keys(self, *value):
+        pass
+
+    def click(self):
+        pass
+
+
+class FakeDriver:
+    """WebDriver stub where every chat loads instantly and every send succeeds."""
+
+    def __init__(self):
+        self.element = FakeElement()
+        self.current_url = ""
+
+    def _is_error_lookup(self, value):
+        return value is not None and any(marker in value for marker in ERROR_MARKERS)
+
+    def get(self, url):
+        self.current_url = url
+
+    def refresh(self):
+        pass
+
+    def find_element(self, by=None, value=None, *more):
+        if self._is_error_lookup(value):
+            raise NoSuchElementException(value)
+        return self.element
+
+    def find_elements(self, by=None, value=None, *more):
+        if self._is_error_lookup(value):
+            return []
+        return [self.element]
+
+    def execute_script(self, script, *args):
+        return True
+
+    def save_screenshot(self, filename):
+        return True
+
+    def quit(self):
+        pass
+
+
+def make_contacts(count):
+    """Builds a contact table shaped like a loaded spreadsheet."""
+    return pd.DataFrame({
+        "Phone": [f"98{i % 100000000:08d}" for i in range(count)],
+        "Name": [f"Contact {i}" for i in range(count)],
+    })
+
+
+@contextlib.contextmanager
+def fast_environment():
+    """Patch out everything that is not orchestration work."""
+    # Result DataFrames are still built; only the file writes are skipped
+    with open(os.devnull, "w") as devnull, \
+            contextlib.redirect_stdout(devnull), \
+            contextlib.redirect_stderr(devnull), \
+            mock.patch.object(bulk.time, "sleep", lambda seconds: None), \
+            mock.patch.object(builtins, "input", lambda prompt="": "y"), \
+            mock.patch.object(pd.DataFrame, "to_csv", lambda self, *args, **kwargs: None), \
+            mock.patch.object(pd.DataFrame, "to_excel", lambda self, *args, **kwargs: None):
+        logging.disable(logging.CRITICAL)
+        try:
+            yield
+        finally:
+            logging.disable(logging.NOTSET)
+
+
+# Runners return what they keep per contact, so the retained figure covers it
+
+
+def run_send_message(contacts_df, batch_size):
+    driver = FakeDriver()
+    return [
+        bulk.send_message(driver, bulk.format_phone_number(phone, COUNTRY_CODE), MESSAGE)
+        for phone in contacts_df["Phone"]
+    ]
+
+
+def run_send_message_improved(contacts_df, batch_size):
+    driver = FakeDriver()
+    return [
+        bulk.send_message_improved(driver, bulk.format_phone_number(phone, COUNTRY_CODE), MESSAGE)
+        for phone in contacts_df["Phone"]
+    ]
+
+
+def run_batch(contacts_df, batch_size):
+    return bulk.batch_process_contacts(
+        FakeDriver(), contacts_df, "Phone", MESSAGE, None, batch_size, COUNTRY_CODE
+    )
+
+
+def run_pipelined_batch(contacts_df, batch_size):
+    return bulk.batch_process_contacts(
+        FakeDriver(), contacts_df, "Phone", MESSAGE, None, batch_size, COUNTRY_CODE, pipeline=True
+    )
+
+
+MODES = {
+    "send_message": run_send_message,
+    "send_message_improved": run_send_message_improved,
+    "batch": run_batch,
+    "pipelined_batch": run_pipelined_batch,
+}
+
+
+def measure(runner, count, batch_size, trace_memory=True):
+    """Returns throughput and memory figures for one mode at one size."""
+    contacts_df = make_contacts(count)
+
+    # Timing pass without tracemalloc, which would slow every allocation down
+    gc.collect()
+    with fast_environment():
+        start = time.perf_counter()
+        runner(contacts_df, batch_size)
+        elapsed = time.perf_counter() - start
+
+    result = {
+        "contacts": count,
+        "seconds": elapsed,
+        "contacts_per_sec": count / elapsed if elapsed else float("inf"),
+    }
+
+    if trace_memory:
+        # tracemalloc tracks live memory: the peak covers everything the loop holds at once
+        # (results, result tables), the retained figure what it hands back per contact
+        gc.collect()
+        tracemalloc.start()
+        base_current, _ = tracemalloc.get_traced_memory()
+        with fast_environment():
+            output = runner(contacts_df, batch_size)
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del output
+        result["peak_bytes_per_contact"] = (peak - base_current) / count
+        result["retained_bytes_per_contact"] = (current - base_current) / count
+        result["peak_mib"] = (peak - base_current) / (1024 * 1024)
+
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-contact orchestration overhead with a fake WebDriver.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000],
+                        help="Contact counts to run (default: 10000 100000 1000000)")
+    parser.add_argument("--modes", nargs="+", choices=sorted(MODES), default=sorted(MODES),
+                        help="Code paths to measure (default: all)")
+    parser.add_argument("--batch-size", type=int, default=10,
+                        help="Batch size passed to batch_process_contacts (default: 10)")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="Skip the tracemalloc pass")
+    parser.add_argument("--min-contacts-per-sec", type=float, default=None,
+                        help="Exit with status 1 if any run is slower than this")
+    args = parser.parse_args()
+
+    header = (f"{'mode':<22} {'contacts':>10} {'seconds':>9} {'contacts/s':>11}"
+              f" {'peak bytes/contact':>19} {'retained bytes/contact':>23} {'peak MiB':>9}")
+    print(header)
+    print("-" * len(header))
+
+    too_slow = []
+    for mode in args.modes:
+        for count in args.sizes:
+            result = measure(MODES[mode], count, args.batch_size, trace_memory=not args.no_memory)
+            line = f"{mode:<22} {count:>10} {result['seconds']:>9.2f} {result['contacts_per_sec']:>11.0f}"
+            if not args.no_memory:
+                line += (f" {result['peak_bytes_per_contact']:>19.1f}"
+                         f" {result['retained_bytes_per_contact']:>23.1f}"
+                         f" {result['peak_mib']:>9.1f}")
+            print(line, flush=True)
+
+            if args.min_contacts_per_sec is not None and result["contacts_per_sec"] < args.min_contacts_per_sec:
+                too_slow.append((mode, count, result["contacts_per_sec"]))
+
+    if too_slow:
+        for mode, count, rate in too_slow:
+            print(f"REGRESSION: {mode} at {count} contacts ran at {rate:.0f} contacts/s "
+                  f"(minimum {args.min_contacts_per_sec:.0f})")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
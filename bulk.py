@@ -3,6 +3,7 @@ import time
 import os
 import logging
 import random
+import hashlib
 from datetime import datetime
 from tqdm import tqdm
 from selenium import webdriver
@@ -25,26 +26,131 @@ logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(levelname)s - %(message)s"
 )
+
+# Parsed contact cache settings
+CONTACT_CACHE_DIR = os.path.join(os.getcwd(), "contact_cache")
+CONTACT_CACHE_MAX_BYTES = 200 * 1024 * 1024  # Evict least recently used entries above 200 MB
+CONTACT_CACHE_VERSION = 2  # Bump whenever phone number normalization changes
+FORMATTED_PHONE_COLUMN = "_formatted_phone"
+
+# National numbering plans: country code -> (trunk prefix, valid national number lengths, valid leading digits)
+NUMBERING_PLANS = {
+    "1": ("1", (10,), "23456789"),              # USA, Canada and other NANP countries
+    "7": ("8", (10,), "34789"),                 # Russia, Kazakhstan
+    "20": ("0", (8, 9, 10), "123456789"),       # Egypt
+    "27": ("0", (9,), "12345678"),              # South Africa
+    "30": ("", (10,), "2689"),                  # Greece
+    "31": ("0", (9,), "123456789"),             # Netherlands
+    "32": ("0", (8, 9), "123456789"),           # Belgium
+    "33": ("0", (9,), "123456789"),             # France
+    "34": ("", (9,), "6789"),                   # Spain
+    "39": ("", (6, 7, 8, 9, 10, 11), "0389"),   # Italy (landlines keep their leading 0)
+    "44": ("0", (9, 10), "123789"),             # United Kingdom
+    "49": ("0", (6, 7, 8, 9, 10, 11, 12, 13), "123456789"),  # Germany
+    "52": ("", (10,), "123456789"),             # Mexico
+    "54": ("0", (10, 11), "123456789"),         # Argentina
+    "55": ("0", (10, 11), "123456789"),         # Brazil
+    "60": ("0", (8, 9, 10), "123456789"),       # Malaysia
+    "61": ("0", (9,), "23478"),                 # Australia
+    "62": ("0", (8, 9, 10, 11, 12), "123456789"),  # Indonesia
+    "63": ("0", (8, 9, 10), "23456789"),        # Philippines
+    "65": ("", (8,), "3689"),                   # Singapore
+    "66": ("0", (8, 9), "123456789"),           # Thailand
+    "81": ("0", (9, 10), "123456789"),          # Japan
+    "82": ("0", (8, 9, 10), "123456789"),       # South Korea
+    "84": ("0", (9, 10), "123456789"),          # Vietnam
+    "86": ("0", (10, 11), "123456789"),         # China
+    "90": ("0", (10,), "23458"),                # Turkey
+    "91": ("0", (10,), "123456789"),            # India
+    "92": ("0", (9, 10), "123456789"),          # Pakistan
+    "94": ("0", (9,), "123456789"),             # Sri Lanka
+    "234": ("0", (8, 10), "123456789"),         # Nigeria
+    "254": ("0", (9,), "123456789"),            # Kenya
+    "880": ("0", (6, 7, 8, 9, 10), "123456789"),  # Bangladesh
+    "966": ("0", (8, 9), "123456789"),          # Saudi Arabia
+    "971": ("0", (8, 9), "2345679"),            # United Arab Emirates
+}
+
+def compile_numbering_plans(plans):
+    """Compiles numbering plans into set-based lookups so each check is O(1)."""
+    table = {
+        country_code: (trunk_prefix, frozenset(lengths), frozenset(leading_digits))
+        for country_code, (trunk_prefix, lengths, leading_digits) in plans.items()
+    }
+    # Country codes are prefix-free, so trying each possible length finds at most one match
+    code_lengths = tuple(sorted({len(country_code) for country_code in table}))
+    return table, code_lengths
+
+NUMBERING_PLAN_TABLE, COUNTRY_CODE_LENGTHS = compile_numbering_plans(NUMBERING_PLANS)
+
+def match_country_code(phone):
+    """Returns the known country code an international number starts with, or None."""
+    for length in COUNTRY_CODE_LENGTHS:
+        if phone[:length] in NUMBERING_PLAN_TABLE:
+            return phone[:length]
+    return None
+
+def is_valid_national_number(national_number, plan):
+    """Checks a national number (without country code or trunk prefix) against a plan."""
+    _, lengths, leading_digits = plan
+    return (
+        len(national_number) in lengths
+        and national_number[:1] in leading_digits
+        and national_number.isascii()
+        and national_number.isdigit()
+    )
+
+def strip_trunk_prefix(national_number, plan):
+    """Removes the national trunk prefix (e.g. the leading 0 in 09876 543210) if what remains is valid."""
+    trunk_prefix = plan[0]
+    if (
+        trunk_prefix
+        and national_number.startswith(trunk_prefix)
+        and is_valid_national_number(national_number[len(trunk_prefix):], plan)
+    ):
+        return national_number[len(trunk_prefix):]
+    return national_number
+
 # Add this function to the script
 def check_phone_validity(phone, country_code=""):
     """
     Pre-validate phone numbers before attempting to send messages.
+    Numbers for countries in NUMBERING_PLANS are checked against their national
+    length and leading digit rules; other numbers only get a length check.
     Returns True if likely valid, False otherwise.
     """
     # Format checks
     if not phone or not str(phone).strip():
         return False
+    phone = str(phone).strip()
+    
+    # E.164 numbers are ASCII digits only and at most 15 long
+    if not (phone.isascii() and phone.isdigit()) or len(phone) > 15:
+        return False
+    
+    # Use the campaign country code when the number carries it, otherwise detect it
+    if not country_code or not phone.startswith(country_code):
+        country_code = match_country_code(phone) or ""
         
     # Numbers with just country code
     if phone == country_code or len(phone) <= len(country_code) + 2:
         return False
+    
+    plan = NUMBERING_PLAN_TABLE.get(country_code)
+    if plan is not None:
+        return is_valid_national_number(phone[len(country_code):], plan)
         
     # Check for obviously invalid formats
-    if len(phone) < 10 or len(phone) > 15:
+    if len(phone) < 10:
         return False
     
     return True
 
+def validate_phone_numbers(phones, country_code=""):
+    """Validates a Series of formatted numbers in bulk, checking each distinct number once."""
+    verdicts = {phone: check_phone_validity(phone, country_code) for phone in phones.unique()}
+    return phones.map(verdicts).astype(bool)
+
 # Add this function to improve chat opening reliability
 def open_chat_with_retry(driver, phone, max_retries=3):
     """Open WhatsApp chat with retry mechanism and validation."""
@@ -170,15 +276,98 @@ def send_message_improved(driver, phone, message, media_path=None):
         return False, f"Error: {str(e)}"
 
 
-def load_contacts(file_path):
-    """Loads contacts from an Excel file."""
+def contact_cache_key(file_path, phone_column, country_code):
+    """Build a cache key from the file contents and the normalization settings."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    digest.update(f"\0{phone_column}\0{country_code}\0{CONTACT_CACHE_VERSION}".encode("utf-8"))
+    return digest.hexdigest()
+
+def load_cached_contacts(cache_key):
+    """Returns the cached contact table for a key, or None on a cache miss."""
+    cache_file = os.path.join(CONTACT_CACHE_DIR, f"{cache_key}.parquet")
+    if not os.path.exists(cache_file):
+        return None
+    try:
+        df = pd.read_parquet(cache_file)
+    except Exception as e:
+        logging.warning(f"Ignoring unreadable contact cache {cache_file}: {str(e)}")
+        return None
+    
+    # Mark as recently used for eviction; a read-only cache still serves hits
+    try:
+        os.utime(cache_file)
+    except OSError as e:
+        logging.warning(f"Could not update contact cache timestamp {cache_file}: {str(e)}")
+    return df
+
+def save_cached_contacts(cache_key, df):
+    """Stores a parsed contact table in the cache and enforces the size limit."""
+    os.makedirs(CONTACT_CACHE_DIR, exist_ok=True)
+    cache_file = os.path.join(CONTACT_CACHE_DIR, f"{cache_key}.parquet")
+    tmp_file = f"{cache_file}.tmp"
+    try:
+        df.to_parquet(tmp_file, index=False)
+        os.replace(tmp_file, cache_file)
+    except Exception as e:
+        logging.warning(f"Could not write contact cache {cache_file}: {str(e)}")
+        try:
+            os.remove(tmp_file)
+        except OSError:
+            pass
+        return
+    evict_contact_cache()
+
+def evict_contact_cache(max_bytes=CONTACT_CACHE_MAX_BYTES):
+    """Removes least recently used cache entries until the cache fits in max_bytes."""
+    entries = []
+    for name in os.listdir(CONTACT_CACHE_DIR):
+        if not name.endswith(".parquet"):
+            continue
+        path = os.path.join(CONTACT_CACHE_DIR, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total_size <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total_size -= size
+            logging.info(f"Evicted contact cache entry {path}")
+        except OSError as e:
+            logging.warning(f"Could not evict contact cache entry {path}: {str(e)}")
+
+def load_contacts(file_path, phone_column=None, country_code=None):
+    """Loads contacts from an Excel file, reusing the parsed cache when the file is unchanged."""
     if not os.path.exists(file_path):
         logging.error(f"The file '{file_path}' does not exist.")
         print(f"Error: The file '{file_path}' does not exist.")
         exit(1)
     try:
+        cache_key = None
+        if phone_column and country_code is not None:
+            cache_key = contact_cache_key(file_path, phone_column, country_code)
+            cached_df = load_cached_contacts(cache_key)
+            if cached_df is not None:
+                logging.info(f"Loaded contacts from cache for {file_path} with {len(cached_df)} rows.")
+                return cached_df
+        
         df = pd.read_excel(file_path, dtype=str)
         logging.info(f"Loaded contacts from {file_path} with {len(df)} rows.")
+        
+        # Only cache tables we could normalize, so a wrong column name is never cached
+        if cache_key and phone_column in df.columns:
+            df[FORMATTED_PHONE_COLUMN] = df[phone_column].map(
+                lambda phone: format_phone_number(phone, country_code)
+            )
+            save_cached_contacts(cache_key, df)
         return df
     except Exception as e:
         logging.error(f"Error loading contacts: {str(e)}")
@@ -244,7 +433,53 @@ def wait_for_element(driver, xpath, timeout=20, take_screenshot=False, screensho
         logging.error(f"Timeout waiting for element: {xpath}")
         return None
 
-def send_message(driver, phone, message, media_path=None):
+def build_chat_url(phone, message):
+    """Builds the WhatsApp Web URL that opens a chat with the message prefilled."""
+    chat_url = f"https://web.whatsapp.com/send?phone={phone}"
+    if message:
+        chat_url += f"&text={quote(message)}"
+    return chat_url
+
+def wait_for_outgoing_messages(driver, timeout=10):
+    """Wait until no sent message is still pending (clock icon), so leaving the chat is safe."""
+    try:
+        WebDriverWait(driver, timeout).until_not(
+            EC.presence_of_element_located((By.XPATH, '//span[@data-icon="msg-time"]'))
+        )
+        return True
+    except TimeoutException:
+        logging.warning(f"Messages still pending after {timeout} seconds")
+        return False
+    except Exception as e:
+        logging.error(f"Error checking pending messages: {str(e)}")
+        return False
+
+def prefetch_chat(driver, phone, message, timeout=20):
+    """
+    Open the chat for the next contact ahead of time so it loads during the pacing delay.
+    Returns "loaded", "invalid" or "timeout".
+    """
+    textbox_xpath = '//div[@id="main"]//footer//div[@role="textbox"]'
+    invalid_xpath = '//div[contains(text(), "Phone number shared via url is invalid")]'
+    try:
+        driver.get(build_chat_url(phone, message))
+        logging.info(f"Preloading chat with {phone}...")
+        WebDriverWait(driver, timeout).until(EC.any_of(
+            EC.presence_of_element_located((By.XPATH, textbox_xpath)),
+            EC.presence_of_element_located((By.XPATH, invalid_xpath))
+        ))
+        if driver.find_elements(By.XPATH, invalid_xpath):
+            logging.error(f"Invalid number: {phone}")
+            return "invalid"
+        return "loaded"
+    except TimeoutException:
+        logging.warning(f"Timeout preloading chat for {phone}")
+        return "timeout"
+    except Exception as e:
+        logging.error(f"Error preloading chat for {phone}: {str(e)}")
+        return "timeout"
+
+def send_message(driver, phone, message, media_path=None, chat_preloaded=False):
     """Sends a message and media to a contact, ensuring both are sent together."""
     try:
         # Use encoded message for URL
@@ -252,14 +487,11 @@ def send_message(driver, phone, message, media_path=None):
         if message:
             encoded_message = quote(message)
         
-        # Navigate directly to the contact's chat
-        chat_url = f"https://web.whatsapp.com/send?phone={phone}"
-        if encoded_message:
-            chat_url += f"&text={encoded_message}"
-            
-        driver.get(chat_url)
-        logging.info(f"Opening chat with {phone}...")
-        print(f"Opening chat with {phone}...")
+        # Navigate directly to the contact's chat, unless prefetch_chat already opened it
+        if not chat_preloaded:
+            driver.get(build_chat_url(phone, message))
+            logging.info(f"Opening chat with {phone}...")
+            print(f"Opening chat with {phone}...")
         
         # Wait for the chat to load
         chat_input = wait_for_element(
@@ -492,42 +724,155 @@ def send_message(driver, phone, message, media_path=None):
 
 def format_phone_number(phone, country_code):
     """Format phone number with country code."""
-    # Remove non-digit characters
-    phone = ''.join(filter(str.isdigit, str(phone).strip()))
+    raw_phone = str(phone).strip()
+    # Remove everything except ASCII digits
+    phone = ''.join(ch for ch in raw_phone if '0' <= ch <= '9')
+    
+    # Numbers written in international format carry their own country code,
+    # but may still keep the trunk prefix, as in +44 (0)7911 123456
+    if raw_phone.startswith("+") or phone.startswith("00"):
+        if not raw_phone.startswith("+"):
+            phone = phone[2:]
+        own_country_code = match_country_code(phone)
+        if own_country_code is None:
+            return phone
+        national_number = phone[len(own_country_code):]
+        return own_country_code + strip_trunk_prefix(national_number, NUMBERING_PLAN_TABLE[own_country_code])
+    
+    plan = NUMBERING_PLAN_TABLE.get(country_code)
+    if plan is None:
+        # Unknown numbering plan: add country code if not present
+        if not phone.startswith(country_code):
+            phone = country_code + phone
+        return phone
     
-    # Add country code if not present
-    if not phone.startswith(country_code):
-        phone = country_code + phone
+    # Only treat the leading digits as the country code if the rest is a valid national number
+    # (after dropping a trunk prefix, as in 91 09876543210), so local numbers that happen to
+    # start with the same digits are not mangled
+    if phone.startswith(country_code):
+        national_number = strip_trunk_prefix(phone[len(country_code):], plan)
+        if is_valid_national_number(national_number, plan):
+            return country_code + national_number
+    
+    return country_code + strip_trunk_prefix(phone, plan)
+
+def save_results(results):
+    """Saves the final results and a separate file of failed contacts for retry."""
+    results_df = pd.DataFrame(results)
+    results_file = f"whatsapp_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+    results_df.to_excel(results_file, index=False)
+    print(f"Final results saved to {results_file}")
     
-    return phone
+    # Save failed contacts separately for retry
+    failed_df = results_df[results_df["status"] == "Failed"]
+    if not failed_df.empty:
+        failed_file = f"failed_contacts_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+        failed_df.to_excel(failed_file, index=False)
+        print(f"Failed contacts saved to {failed_file}")
 
-def batch_process_contacts(driver, contacts_df, phone_column, message, media_path=None, batch_size=10):
-    """Process contacts in batches to improve overall speed."""
-    country_code = input("Enter country code (e.g., 91 for India, without +): ")
+def save_interim_results(results, saved_count, interim_file):
+    """
+    Appends the results added since the last save to the interim CSV file,
+    so progress survives a crash without rewriting every earlier row each batch.
+    Returns the number of results saved so far.
+    """
+    new_results = results[saved_count:]
+    if new_results:
+        pd.DataFrame(new_results).to_csv(interim_file, mode="a", header=saved_count == 0, index=False)
+        print(f"Interim results saved to {interim_file}")
+    return len(results)
+
+def batch_process_contacts(driver, contacts_df, phone_column, message, media_path=None, batch_size=10, country_code=None, pipeline=False):
+    """
+    Process contacts in batches to improve overall speed.
+    With pipeline=True the next contact's chat is loaded during the delay after each send,
+    and the next send waits for whatever is left of that delay. The random delay and the
+    batch break are still enforced between sends; only the chat load stops adding to them.
+    """
+    if country_code is None:
+        country_code = input("Enter country code (e.g., 91 for India, without +): ")
+    
+    # Normalize phone numbers once unless the loader already did it
+    if FORMATTED_PHONE_COLUMN not in contacts_df.columns:
+        contacts_df = contacts_df.assign(**{
+            FORMATTED_PHONE_COLUMN: contacts_df[phone_column].map(
+                lambda phone: format_phone_number(phone, country_code)
+            )
+        })
     
     successful = 0
     failed = 0
     results = []
     
     total_contacts = len(contacts_df)
-    print(f"\nSending messages to {total_contacts} contacts...")
+    
+    # Validate phone numbers offline before any browser work
+    print("Pre-validating phone numbers...")
+    valid_mask = validate_phone_numbers(contacts_df[FORMATTED_PHONE_COLUMN], country_code)
+    invalid_df = contacts_df[~valid_mask]
+    
+    if not invalid_df.empty:
+        print(f"\nWARNING: Found {len(invalid_df)} potentially invalid phone numbers.")
+        show_invalid = input("Would you like to see them before proceeding? (y/n): ").lower()
+        if show_invalid == 'y':
+            for index, row in invalid_df.iterrows():
+                print(f"Row {index}: {row[FORMATTED_PHONE_COLUMN]} (original: {row[phone_column]})")
+        proceed = input("\nContinue only with valid numbers? (y/n): ").lower()
+        if proceed == 'y':
+            # Record rejected numbers as failures so they end up in the retry file
+            for phone in invalid_df[FORMATTED_PHONE_COLUMN]:
+                results.append({"phone": phone, "status": "Failed", "result": "Invalid phone number (rejected before sending)"})
+            failed += len(invalid_df)
+            logging.info(f"Rejected {len(invalid_df)} invalid phone numbers before sending")
+            contacts_df = contacts_df[valid_mask]
+    
+    if contacts_df.empty:
+        print("No valid contacts to process.")
+        if results:
+            save_results(results)
+        return 0, failed
+    
+    print(f"\nSending messages to {len(contacts_df)} contacts...")
     
     # Create batches of contacts
     batches = [contacts_df[i:i + batch_size] for i in range(0, len(contacts_df), batch_size)]
     batch_number = 1
     
+    # One interim file per run that each batch appends to
+    interim_file = f"whatsapp_interim_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    saved_count = 0
+    
+    # Pipeline state: which chat is already open in the browser and when the next send may start
+    phones = contacts_df[FORMATTED_PHONE_COLUMN].tolist()
+    position = 0
+    preloaded_phone = None
+    preload_status = None
+    next_send_at = 0.0
+    
     for batch_df in batches:
         print(f"\nProcessing batch {batch_number}/{len(batches)} ({len(batch_df)} contacts)")
         
         # Process each contact in the batch
         for index, row in tqdm(batch_df.iterrows(), total=len(batch_df), desc="Batch progress"):
-            # Format phone number
-            phone = format_phone_number(row[phone_column], country_code)
+            phone = row[FORMATTED_PHONE_COLUMN]
+            position += 1
             
             print(f"\nProcessing contact {index+1} (overall {successful+failed+1}/{total_contacts}): {phone}")
             
-            # Send message
-            success, result = send_message(driver, phone, message, media_path)
+            chat_preloaded = pipeline and preloaded_phone == phone and preload_status == "loaded"
+            rejected_on_preload = pipeline and preloaded_phone == phone and preload_status == "invalid"
+            if rejected_on_preload:
+                # Found while preloading, nothing is sent so no delay is owed
+                success, result = False, "Invalid phone number"
+            else:
+                if pipeline:
+                    remaining = next_send_at - time.monotonic()
+                    if remaining > 0:
+                        print(f"Waiting {remaining:.1f} seconds before next message...")
+                        time.sleep(remaining)
+                
+                # Send message
+                success, result = send_message(driver, phone, message, media_path, chat_preloaded)
             
             # Record result
             status = "Sent" if success else "Failed"
@@ -540,69 +885,48 @@ def batch_process_contacts(driver, contacts_df, phone_column, message, media_pat
                 failed += 1
                 print(f"✗ Failed: {result}")
             
-            # Add randomized delay between messages to reduce detection risk
-            # Shorter delay with randomization to avoid detection patterns
-            if media_path:
-                delay = random.uniform(5, 10)  # Random delay between 5-10 seconds for media
-            else:
-                delay = random.uniform(3, 7)   # Random delay between 3-7 seconds for text
+            if not rejected_on_preload:
+                # Add randomized delay between messages to reduce detection risk
+                # Shorter delay with randomization to avoid detection patterns
+                if media_path:
+                    delay = random.uniform(5, 10)  # Random delay between 5-10 seconds for media
+                else:
+                    delay = random.uniform(3, 7)   # Random delay between 3-7 seconds for text
                 
-            print(f"Waiting {delay:.1f} seconds before next message...")
-            time.sleep(delay)
+                if pipeline:
+                    # The next send waits for whatever is left of the delay
+                    next_send_at = time.monotonic() + delay
+                else:
+                    print(f"Waiting {delay:.1f} seconds before next message...")
+                    time.sleep(delay)
+            
+            if pipeline:
+                # Load the next chat while the delay runs down
+                preloaded_phone = None
+                if position < len(phones):
+                    if success:
+                        wait_for_outgoing_messages(driver)
+                    preloaded_phone = phones[position]
+                    preload_status = prefetch_chat(driver, preloaded_phone, message)
         
         # After each batch, take a slightly longer break
         if batch_number < len(batches):
             batch_break = random.uniform(12, 18)  # 12-18 seconds between batches
             print(f"\nCompleted batch {batch_number}/{len(batches)}. Taking a {batch_break:.1f} second break...")
-            time.sleep(batch_break)
+            if pipeline:
+                # The break comes on top of the pending delay, as in the serial loop
+                next_send_at = max(next_send_at, time.monotonic()) + batch_break
+            else:
+                time.sleep(batch_break)
         
         batch_number += 1
         
         # Save interim results after each batch
-        interim_df = pd.DataFrame(results)
-        interim_file = f"whatsapp_interim_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-        interim_df.to_excel(interim_file, index=False)
-        print(f"Interim results saved to {interim_file}")
-        # Validate phone numbers before processing
-    print("Pre-validating phone numbers...")
-    valid_contacts = []
-    invalid_contacts = []
-    
-    for index, row in contacts_df.iterrows():
-        phone = format_phone_number(row[phone_column], country_code)
-        if check_phone_validity(phone, country_code):
-            valid_contacts.append((index, row, phone))
-        else:
-            invalid_contacts.append((index, row, phone))
-    
-    if invalid_contacts:
-        print(f"\nWARNING: Found {len(invalid_contacts)} potentially invalid phone numbers.")
-        show_invalid = input("Would you like to see them before proceeding? (y/n): ").lower()
-        if show_invalid == 'y':
-            for _, row, phone in invalid_contacts:
-                print(f"Row {row.name}: {phone} (original: {row[phone_column]})")
-        proceed = input("\nContinue only with valid numbers? (y/n): ").lower()
-        if proceed != 'y':
-            # Include invalid numbers
-            valid_contacts.extend(invalid_contacts)
-    
-    if not valid_contacts:
-        print("No valid contacts to process.")
-        return 0, 0
+        saved_count = save_interim_results(results, saved_count, interim_file)
     
     # Save final results
     print(f"\nAll batches completed: {successful} successful, {failed} failed out of {total_contacts}")
-    results_df = pd.DataFrame(results)
-    results_file = f"whatsapp_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-    results_df.to_excel(results_file, index=False)
-    print(f"Final results saved to {results_file}")
-    
-    # Save failed contacts separately for retry
-    failed_df = results_df[results_df["status"] == "Failed"]
-    if not failed_df.empty:
-        failed_file = f"failed_contacts_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-        failed_df.to_excel(failed_file, index=False)
-        print(f"Failed contacts saved to {failed_file}")
+    save_results(results)
     
     return successful, failed
 
@@ -646,9 +970,10 @@ def main():
         # Get inputs
         contacts_file = input("Enter the path to Excel file with contacts: ")
         phone_column = input("Enter the column name containing phone numbers: ")
+        country_code = input("Enter country code (e.g., 91 for India, without +): ")
         
         # Load contacts
-        contacts_df = load_contacts(contacts_file)
+        contacts_df = load_contacts(contacts_file, phone_column, country_code)
         
         if contacts_df.empty:
             print("No contacts found in the file.")
@@ -692,6 +1017,9 @@ def main():
             batch_size = 10
             print("Invalid batch size. Using default: 10")
         
+        # Ask whether to preload the next chat during the wait between messages
+        pipeline = input("\nPreload the next chat while waiting between messages? (y/n): ").lower() == 'y'
+        
         # Initialize driver
         driver = initialize_whatsapp()
         
@@ -722,7 +1050,7 @@ def main():
             return
         
         # Process contacts
-        successful, failed = batch_process_contacts(driver, contacts_df, phone_column, message, media_path, batch_size)
+        successful, failed = batch_process_contacts(driver, contacts_df, phone_column, message, media_path, batch_size, country_code, pipeline)
         
         # Summary
         print("\nSummary:")
@@ -0,0 +1,75 @@
+"""
+Expected results for phone number formatting and validation.
+
+Run with: python -m pytest test_phone_numbers.py
+"""
+import logging
+
+import pytest
+
+# Give the root logger a handler first so importing bulk does not create a log file
+logging.basicConfig(handlers=[logging.NullHandler()])
+
+import bulk
+
+# (raw input, campaign country code, formatted number)
+FORMAT_CASES = [
+    # Local numbers get the country code
+    ("9876543210", "91", "919876543210"),
+    ("98765 43210", "91", "919876543210"),
+    # Already carries the country code
+    ("919876543210", "91", "919876543210"),
+    ("12125551234", "1", "12125551234"),
+    # Local number that happens to start with the country code digits
+    ("9198765432", "91", "919198765432"),
+    # Trunk prefix is stripped, with or without the country code in front
+    ("09876543210", "91", "919876543210"),
+    ("91 09876543210", "91", "919876543210"),
+    ("07911 123456", "44", "447911123456"),
+    ("89161234567", "7", "79161234567"),
+    # NANP trunk prefix equals the country code
+    ("2125551234", "1", "12125551234"),
+    # + and 00 input keeps its own country code and drops the trunk prefix
+    ("+44 7911 123456", "91", "447911123456"),
+    ("0044 7911 123456", "91", "447911123456"),
+    ("+91 09876543210", "91", "919876543210"),
+    ("+44 (0)7911 123456", "91", "447911123456"),
+    # Italian landlines keep their leading 0
+    ("06 1234 5678", "39", "390612345678"),
+    # Unknown numbering plans only get the country code added if missing
+    ("5551234567", "999", "9995551234567"),
+    ("9995551234567", "999", "9995551234567"),
+    ("+999 555 1234", "91", "9995551234"),
+    # Only ASCII digits are kept
+    ("٩٨٧٦٥٤٣٢١٠", "91", "91"),
+]
+
+# (formatted number, campaign country code, expected validity)
+VALIDITY_CASES = [
+    ("919876543210", "91", True),
+    ("919198765432", "91", True),
+    ("91987654321", "91", False),       # too short for India
+    ("9109876543210", "91", False),     # trunk prefix left in
+    ("447911123456", "91", True),       # other country detected from the number
+    ("4407911123456", "44", False),
+    ("12125551234", "1", True),
+    ("11125551234", "1", False),        # NANP area codes do not start with 1
+    ("6591234567", "65", True),
+    ("6551234567", "65", False),        # Singapore numbers do not start with 5
+    ("9995551234567", "999", True),     # unknown plan: length check only
+    ("99955512", "999", False),
+    ("91", "91", False),
+    ("", "91", False),
+    ("1234567890123456", "", False),    # longer than E.164 allows
+    ("٩٨٧٦٥٤٣٢١٠٩٨", "", False),
+]
+
+
+@pytest.mark.parametrize("raw_phone, country_code, expected", FORMAT_CASES)
+def test_format_phone_number(raw_phone, country_code, expected):
+    assert bulk.format_phone_number(raw_phone, country_code) == expected
+
+
+@pytest.mark.parametrize("phone, country_code, expected", VALIDITY_CASES)
+def test_check_phone_validity(phone, country_code, expected):
+    assert bulk.check_phone_validity(phone, country_code) is expected